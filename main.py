@@ -5,78 +5,437 @@
 
 import argparse
 import csv
+import heapq
+import math
+import os
 import sys
-from typing import List, Dict, Tuple
-from tabulate import tabulate
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+# pyarrow — необязательная зависимость движка 'arrow'; импортируется только
+# при его использовании (см. _load_pyarrow), чтобы не замедлять запуск
+pa = None
+pc = None
+pac = None
+pq = None
 
+# Запись о товаре: (бренд, рейтинг, название) в виде строк из CSV
+Record = Tuple[str, str, str]
 
-def read_csv_files(file_paths: List[str]) -> List[Dict[str, str]]:
+# Ключ метаданных Parquet-кэша с предупреждениями о некорректных рейтингах
+CACHE_WARNINGS_KEY = b'rating_warnings'
+
+# Числа, которые Arrow гарантированно приводит к float
+RATING_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+
+def _load_pyarrow() -> None:
     """
-    Читает CSV-файлы и возвращает объединённый список записей.
+    Импортирует pyarrow при первом обращении к движку 'arrow'.
+
+    Raises:
+        ImportError: Если pyarrow не установлен.
+    """
+    global pa, pc, pac, pq
+    if pa is not None:
+        return
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.csv
+    import pyarrow.parquet
+    pc, pac, pq = pyarrow.compute, pyarrow.csv, pyarrow.parquet
+    pa = pyarrow
+
+
+def stream_records(file_paths: List[str]) -> Iterator[Record]:
+    """
+    Построчно читает CSV-файлы и по одной отдаёт записи.
+
+    Записи не накапливаются в памяти, поэтому при потоковой агрегации
+    расход памяти зависит от числа брендов, а не от числа строк. Позиции
+    нужных столбцов определяются один раз по заголовку файла, строки
+    читаются как списки без построения словаря.
 
     Args:
         file_paths: Список путей к CSV-файлам.
 
-    Returns:
-        Список словарей с данными из всех файлов.
+    Yields:
+        Кортежи (бренд, рейтинг, название) очередной строки; если столбца
+        'name' нет, название — пустая строка.
 
     Raises:
         FileNotFoundError: Если файл не найден.
         csv.Error: Если ошибка при чтении CSV.
     """
-    all_records = []
     for file_path in file_paths:
         try:
-            with open(file_path, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
+            # newline='' — модуль csv сам разбирает переводы строк, в том числе внутри кавычек;
+            # utf-8-sig пропускает BOM в начале файла (например, в выгрузках из Excel)
+            with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
+                reader = csv.reader(file)
+                header = next(reader, None)
+                if header is None:
+                    continue
+                missing = [column for column in ('brand', 'rating') if column not in header]
+                if missing:
+                    print(
+                        f"Ошибка: в CSV-файле {file_path} нет столбцов: {', '.join(missing)}",
+                        file=sys.stderr
+                    )
+                    sys.exit(1)
+                bi = header.index('brand')
+                ri = header.index('rating')
+                # 'name' нужен только для предупреждений и может отсутствовать
+                ni = header.index('name') if 'name' in header else None
+                width = max(bi, ri, ni or 0) + 1
                 for row in reader:
-                    all_records.append(row)
+                    if not row:
+                        continue
+                    if len(row) < width:
+                        # Как и в движке 'arrow', неполная строка — ошибка формата
+                        raise csv.Error(
+                            f"строка {reader.line_num}: ожидалось полей — {len(header)}, "
+                            f"получено — {len(row)}"
+                        )
+                    yield row[bi], row[ri], (row[ni] if ni is not None else '')
         except FileNotFoundError:
             print(f"Ошибка: файл не найден — {file_path}", file=sys.stderr)
             sys.exit(1)
         except csv.Error as e:
             print(f"Ошибка при чтении CSV-файла {file_path}: {e}", file=sys.stderr)
             sys.exit(1)
-    return all_records
 
 
-def calculate_average_rating(records: List[Dict[str, str]]) -> List[Tuple[str, float]]:
+def read_csv_files(file_paths: List[str]) -> Dict[str, List[str]]:
+    """
+    Читает CSV-файлы и возвращает их данные по столбцам.
+
+    Функция предназначена для использования как библиотеки; отчёт из
+    командной строки её не вызывает. Данные хранятся в виде отдельных
+    списков для каждого столбца, а не списка записей: так на строку не
+    приходится отдельный объект, что уменьшает объём хранимого результата.
+    Расчёт рейтинга от этого не ускоряется — calculate_average_rating
+    получает столбцы через zip, то есть снова построчно.
+
+    Названия брендов интернируются: записи одного бренда ссылаются на одну
+    строку, что уменьшает объём возвращаемых данных. На отчёт из командной
+    строки это не влияет: main читает записи потоком через stream_records,
+    где бренды не интернируются.
+
+    Args:
+        file_paths: Список путей к CSV-файлам.
+
+    Returns:
+        Словарь {'brand': [...], 'rating': [...], 'name': [...]} со значениями
+        из всех файлов; для расчёта рейтинга столбцы объединяются через zip.
+
+    Raises:
+        FileNotFoundError: Если файл не найден.
+        csv.Error: Если ошибка при чтении CSV.
+    """
+    brands: List[str] = []
+    ratings: List[str] = []
+    names: List[str] = []
+    for brand, rating, name in stream_records(file_paths):
+        brands.append(sys.intern(brand))
+        ratings.append(rating)
+        names.append(name)
+    return {'brand': brands, 'rating': ratings, 'name': names}
+
+
+def _format_invalid_rating(rating: str, name: str, brand: str) -> str:
+    """Формирует предупреждение о записи с некорректным рейтингом."""
+    return (
+        f"Предупреждение: некорректный рейтинг '{rating}' "
+        f"для товара {name}, бренд {brand}. Пропускаем."
+    )
+
+
+def _coerce_ratings_arrow(table: "pa.Table") -> Tuple["pa.Table", List[str]]:
+    """
+    Приводит строковый столбец 'rating' к float, заменяя некорректные значения на null.
+
+    Проверка и приведение выполняются над всем столбцом сразу.
+
+    Args:
+        table: Таблица Arrow со столбцами 'name', 'brand' и строковым 'rating'.
+
+    Returns:
+        Таблица, в которой 'rating' имеет тип float64, и список предупреждений
+        о пропущенных записях.
+    """
+    raw = pc.utf8_trim_whitespace(table['rating'])
+    valid = pc.fill_null(pc.match_substring_regex(raw, RATING_PATTERN), False)
+    invalid = table.filter(pc.invert(valid))
+    warnings = [
+        _format_invalid_rating(rating, name or '', brand)
+        for rating, name, brand in zip(
+            invalid.column('rating').to_pylist(),
+            invalid.column('name').to_pylist(),
+            invalid.column('brand').to_pylist(),
+        )
+    ]
+    ratings = pc.cast(pc.if_else(valid, raw, None), pa.float64())
+    table = table.set_column(table.schema.get_field_index('rating'), 'rating', ratings)
+    return table, warnings
+
+
+def _is_cache_fresh(file_path: str, cache_path: str) -> bool:
+    """Проверяет, что Parquet-кэш существует и не старше исходного CSV-файла."""
+    return (
+        os.path.exists(cache_path)
+        and os.path.getmtime(cache_path) >= os.path.getmtime(file_path)
+    )
+
+
+def _read_parquet_cache(cache_path: str) -> Optional["pa.Table"]:
+    """
+    Читает Parquet-кэш и повторно выводит сохранённые в нём предупреждения.
+
+    Returns:
+        Таблица со столбцами 'brand' и 'rating' или None, если кэш повреждён.
+    """
+    try:
+        table = pq.read_table(cache_path, columns=['brand', 'rating'])
+    except (pa.ArrowException, OSError):
+        return None
+    warnings = (table.schema.metadata or {}).get(CACHE_WARNINGS_KEY)
+    if warnings:
+        sys.stderr.write(warnings.decode('utf-8'))
+    return table.replace_schema_metadata(None)
+
+
+def _write_parquet_cache(table: "pa.Table", cache_path: str, warnings: List[str]) -> None:
+    """
+    Сохраняет таблицу и предупреждения о некорректных рейтингах в Parquet-кэш.
+
+    Файл сначала пишется во временный файл в том же каталоге и затем
+    атомарно заменяет кэш, поэтому прерванный или параллельный запуск
+    не оставляет недописанный кэш.
+    """
+    if warnings:
+        table = table.replace_schema_metadata(
+            {CACHE_WARNINGS_KEY: ("\n".join(warnings) + "\n").encode('utf-8')}
+        )
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(cache_path) + '.',
+            suffix='.tmp',
+            dir=os.path.dirname(cache_path) or '.',
+        )
+        os.close(fd)
+        pq.write_table(table, tmp_path, compression='snappy')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Предупреждение: не удалось сохранить кэш {cache_path}: {e}", file=sys.stderr)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_csv_file_arrow(
+    file_path: str,
+    read_options: "pac.ReadOptions",
+    numeric_options: "pac.ConvertOptions",
+    text_options: "pac.ConvertOptions",
+    cache_parquet: bool,
+) -> "pa.Table":
+    """Читает один CSV-файл (или его Parquet-кэш) для read_csv_files_arrow."""
+    cache_path = file_path + '.parquet'
+    warnings: List[str] = []
+    try:
+        if os.path.getsize(file_path) == 0:
+            # Пустой файл пропускается, как и в движке 'python'
+            return pa.schema([
+                ('brand', pa.dictionary(pa.int32(), pa.string())),
+                ('rating', pa.float64()),
+            ]).empty_table()
+        if cache_parquet and _is_cache_fresh(file_path, cache_path):
+            table = _read_parquet_cache(cache_path)
+            if table is not None:
+                return table
+            # Кэш повреждён: разбираем CSV заново и перезаписываем кэш
+        # Файл отображается в память: парсер читает страницы кэша ОС без копирования
+        with pa.memory_map(file_path, 'r') as source:
+            try:
+                # Быстрый путь: рейтинг разбирается в float самим парсером
+                table = pac.read_csv(
+                    source,
+                    read_options=read_options,
+                    convert_options=numeric_options,
+                )
+            except pa.ArrowInvalid:
+                table = None
+            # Парсер принимает inf/-inf, а RATING_PATTERN — нет: такие файлы тоже
+            # перечитываются, чтобы правило проверки не зависело от остальных строк
+            if (
+                table is None
+                or table['rating'].null_count
+                or not pc.all(pc.is_finite(table['rating']), min_count=0).as_py()
+            ):
+                # В файле есть некорректные или пустые рейтинги: читаем их строками,
+                # чтобы вывести предупреждения с названиями товаров
+                source.seek(0)
+                table = pac.read_csv(
+                    source,
+                    read_options=read_options,
+                    convert_options=text_options,
+                )
+                # 'name' нужен только для предупреждений о некорректном рейтинге
+                table, warnings = _coerce_ratings_arrow(table)
+                table = table.select(['brand', 'rating'])
+    except FileNotFoundError:
+        print(f"Ошибка: файл не найден — {file_path}", file=sys.stderr)
+        sys.exit(1)
+    except (pa.ArrowInvalid, pa.ArrowKeyError) as e:
+        print(f"Ошибка при чтении CSV-файла {file_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if warnings:
+        sys.stderr.write("\n".join(warnings) + "\n")
+    if cache_parquet:
+        _write_parquet_cache(table, cache_path, warnings)
+    return table
+
+
+def read_csv_files_arrow(file_paths: List[str], cache_parquet: bool = False) -> "pa.Table":
+    """
+    Читает CSV-файлы средствами PyArrow и возвращает объединённую таблицу.
+
+    Разбор выполняется нативным парсером Arrow; из файла читаются только
+    нужные для отчёта столбцы, остальные пропускаются ещё на этапе
+    разбора. Бренд сразу кодируется словарём (целочисленные коды), а
+    рейтинг разбирается в float самим парсером. Только если в файле есть
+    некорректные, пустые или бесконечные рейтинги, он перечитывается со
+    строковым рейтингом: такие значения заменяются на null с выводом
+    предупреждения. Файлы читаются параллельно в пуле потоков — парсер
+    Arrow отпускает GIL. При включённом кэше рядом с каждым CSV-файлом
+    сохраняется Parquet-копия столбцов 'brand' и 'rating' вместе с
+    предупреждениями о некорректных рейтингах; она используется при
+    следующих запусках, пока CSV-файл не изменится, а повреждённый кэш
+    перезаписывается.
+
+    Args:
+        file_paths: Список путей к CSV-файлам.
+        cache_parquet: Использовать ли Parquet-кэш.
+
+    Returns:
+        Таблица Arrow со столбцами 'brand' и 'rating' из всех файлов.
+
+    Raises:
+        FileNotFoundError: Если файл не найден.
+        pyarrow.ArrowInvalid: Если ошибка при чтении CSV.
+        pyarrow.ArrowKeyError: Если в файле нет нужного столбца.
+        ImportError: Если pyarrow не установлен.
+    """
+    _load_pyarrow()
+    read_options = pac.ReadOptions(block_size=8 << 20)
+    brand_type = pa.dictionary(pa.int32(), pa.string())
+    # Рейтинг хранится во float64: во float32 средние вида 4.55 округляются
+    # иначе, чем в движке 'python'
+    numeric_options = pac.ConvertOptions(
+        column_types={'brand': brand_type, 'rating': pa.float64()},
+        include_columns=['brand', 'rating'],
+    )
+    text_options = pac.ConvertOptions(
+        column_types={'brand': brand_type, 'rating': pa.string(), 'name': pa.string()},
+        include_columns=['name', 'brand', 'rating'],
+        # Столбец 'name' необязателен: если его нет, он заполняется null
+        include_missing_columns=True,
+        # Исходный текст ('NA', 'null' и т. п.) нужен для предупреждения
+        strings_can_be_null=False,
+    )
+    read_file = partial(
+        _read_csv_file_arrow,
+        read_options=read_options,
+        numeric_options=numeric_options,
+        text_options=text_options,
+        cache_parquet=cache_parquet,
+    )
+    max_workers = min(len(file_paths), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tables = list(executor.map(read_file, file_paths))
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def calculate_average_rating(
+    records: Iterable[Record],
+    top: Optional[int] = None,
+) -> List[Tuple[str, float]]:
     """
     Вычисляет средний рейтинг для каждого бренда.
     Args:
-        records: Список словарей с данными о товарах.
+        records: Кортежи (бренд, рейтинг, название) — список или поток записей.
+        top: Сколько брендов с наибольшим рейтингом вернуть (None — все).
     Returns:
         Список кортежей (бренд, средний рейтинг), отсортированный по рейтингу (убывание).
     """
-    brand_ratings = {}
-    brand_counts = {}
-    for record in records:
-        brand = record['brand']
+    # Для каждого бренда — [сумма рейтингов, количество товаров]
+    brand_totals = defaultdict(lambda: [0.0, 0])
+    warnings = []
+    for brand, rating_s, name in records:
         try:
-            rating = float(record['rating'])
+            rating = float(rating_s)
         except ValueError:
-            print(
-                f"Предупреждение: некорректный рейтинг '{record['rating']}' "
-                f"для товара {record['name']}, бренд {brand}. Пропускаем.",
-                file=sys.stderr
-            )
+            rating = math.nan
+        # nan и inf отклоняются, как и в движке 'arrow' (RATING_PATTERN)
+        if not math.isfinite(rating):
+            warnings.append(_format_invalid_rating(rating_s, name, brand))
             continue
-        if brand not in brand_ratings:
-            brand_ratings[brand] = 0.0
-            brand_counts[brand] = 0
-        brand_ratings[brand] += rating
-        brand_counts[brand] += 1
+        totals = brand_totals[brand]
+        totals[0] += rating
+        totals[1] += 1
+    # Все предупреждения выводим одной записью в stderr
+    if warnings:
+        sys.stderr.write("\n".join(warnings) + "\n")
     # Вычисляем средние рейтинги
     average_ratings = [
-        (brand, brand_ratings[brand] / brand_counts[brand])
-        for brand in brand_ratings
+        (brand, total / count)
+        for brand, (total, count) in brand_totals.items()
     ]
+    # Для топа не нужна полная сортировка: достаточно кучи из top элементов
+    if top is not None:
+        return heapq.nlargest(top, average_ratings, key=itemgetter(1))
     # Сортируем по убыванию рейтинга
     average_ratings.sort(key=lambda x: x[1], reverse=True)
     return average_ratings
 
 
+def calculate_average_rating_arrow(
+    table: "pa.Table",
+    top: Optional[int] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Вычисляет средний рейтинг для каждого бренда средствами Arrow.
+
+    Группировка и сортировка выполняются в нативном коде, без обхода
+    записей в Python. Если бренд закодирован словарём, словари всех частей
+    таблицы объединяются, и группировка идёт по целочисленным кодам.
+
+    Args:
+        table: Таблица Arrow со столбцами 'brand' и 'rating'.
+        top: Сколько брендов с наибольшим рейтингом вернуть (None — все).
+    Returns:
+        Список кортежей (бренд, средний рейтинг), отсортированный по рейтингу (убывание).
+    """
+    _load_pyarrow()
+    rated = table.filter(pc.is_valid(table['rating'])).unify_dictionaries()
+    averages = (
+        rated.group_by('brand', use_threads=False)
+        .aggregate([('rating', 'mean')])
+        .sort_by([('rating_mean', 'descending')])
+    )
+    if top is not None:
+        averages = averages.slice(0, top)
+    return list(zip(
+        averages.column('brand').to_pylist(),
+        averages.column('rating_mean').to_pylist(),
+    ))
+
+
 def generate_report(report_type: str, data: List[Tuple[str, float]]) -> None:
     """
     Генерирует и выводит отчёт в консоль.
@@ -91,9 +450,25 @@ def generate_report(report_type: str, data: List[Tuple[str, float]]) -> None:
     if report_type != 'average-rating':
         raise ValueError(f"Неподдерживаемый тип отчёта: {report_type}")
 
-    table_data = [[brand, f"{avg_rating:.1f}"] for brand, avg_rating in data]
-    headers = ["Brand", "Rating"]
-    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+    rows = [(brand, f"{avg_rating:.1f}") for brand, avg_rating in data]
+    headers = ("Brand", "Rating")
+    # Заголовок шире своего текста на два символа, как в прежнем выводе tabulate
+    brand_width = max([len(headers[0]) + 2] + [len(brand) for brand, _ in rows])
+    rating_width = max([len(headers[1]) + 2] + [len(rating) for _, rating in rows])
+
+    # Таблица в формате "grid": рамка из '+', '-', '|' и '=' под заголовком
+    border = f"+-{'-' * brand_width}-+-{'-' * rating_width}-+"
+    lines = [
+        border,
+        f"| {headers[0]:<{brand_width}} | {headers[1]:>{rating_width}} |",
+        border.replace('-', '='),
+    ]
+    for brand, rating in rows:
+        lines.append(f"| {brand:<{brand_width}} | {rating:>{rating_width}} |")
+        lines.append(border)
+    if not rows:
+        lines.append(border)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 
@@ -111,14 +486,44 @@ def main():
         required=True,
         help="Тип отчёта (сейчас поддерживается только 'average-rating')."
     )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "arrow"],
+        default="python",
+        help="Движок чтения CSV: стандартный модуль csv или PyArrow (требует pyarrow)."
+    )
+    parser.add_argument(
+        "--cache-parquet",
+        action="store_true",
+        help="Кэшировать данные в Parquet рядом с CSV-файлами (только для движка 'arrow')."
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        help="Вывести только N брендов с наибольшим средним рейтингом."
+    )
 
     args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("значение --top должно быть положительным числом")
+    if args.cache_parquet and args.engine != "arrow":
+        parser.error("--cache-parquet поддерживается только для движка 'arrow'")
 
     # Читаем данные из файлов
-    records = read_csv_files(args.files)
-
-    # Вычисляем средний рейтинг по брендам
-    average_ratings = calculate_average_rating(records)
+    if args.engine == "arrow":
+        try:
+            _load_pyarrow()
+        except ImportError:
+            print("Ошибка: для движка 'arrow' требуется пакет pyarrow", file=sys.stderr)
+            sys.exit(1)
+        # Чтение и агрегация целиком выполняются в Arrow
+        average_ratings = calculate_average_rating_arrow(
+            read_csv_files_arrow(args.files, cache_parquet=args.cache_parquet),
+            top=args.top,
+        )
+    else:
+        # Записи читаются потоком и сразу агрегируются, не накапливаясь в памяти
+        average_ratings = calculate_average_rating(stream_records(args.files), top=args.top)
 
     # Генерируем отчёт
     try:
@@ -2,14 +2,29 @@
 
 import pytest
 import csv
+import subprocess
+import sys
+from pathlib import Path
 from io import StringIO
 from unittest.mock import patch, mock_open
 from main import (
+    stream_records,
     read_csv_files,
+    read_csv_files_arrow,
     calculate_average_rating,
-    generate_report
+    calculate_average_rating_arrow,
+    generate_report,
+    main
 )
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pac
+except ImportError:
+    pa = None
+
+requires_arrow = pytest.mark.skipif(pa is None, reason="pyarrow не установлен")
+
 
 # --- Тесты для read_csv_files ---
 
@@ -20,11 +35,7 @@ def test_read_csv_files_single_file():
     with patch("builtins.open", mock_open(read_data=mock_csv.getvalue())):
         result = read_csv_files(["file1.csv"])
 
-    assert len(result) == 1
-    assert result[0]["name"] == "phone"
-    assert result[0]["brand"] == "apple"
-    assert result[0]["price"] == "1000"
-    assert result[0]["rating"] == "4.5"
+    assert result == {"brand": ["apple"], "rating": ["4.5"], "name": ["phone"]}
 
 
 def test_read_csv_files_multiple_files():
@@ -38,9 +49,72 @@ def test_read_csv_files_multiple_files():
     ]):
         result = read_csv_files(["file1.csv", "file2.csv"])
 
-    assert len(result) == 2
-    assert result[0]["brand"] == "apple"
-    assert result[1]["brand"] == "samsung"
+    assert result["brand"] == ["apple", "samsung"]
+    assert result["rating"] == ["4.5", "4.7"]
+
+
+def test_read_csv_files_interns_brands():
+    """Тест интернирования названий брендов."""
+    mock_csv = "name,brand,price,rating\np1,apple,1000,4.5\np2,apple,900,4.7"
+
+    with patch("builtins.open", mock_open(read_data=mock_csv)):
+        result = read_csv_files(["file1.csv"])
+
+    assert result["brand"][0] is result["brand"][1]
+
+
+def test_read_csv_files_columns_by_header():
+    """Тест выбора столбцов по заголовку при другом порядке столбцов."""
+    mock_csv = "rating,price,brand,name\n4.5,1000,apple,phone\n\n"
+
+    with patch("builtins.open", mock_open(read_data=mock_csv)):
+        result = read_csv_files(["file1.csv"])
+
+    assert result == {"brand": ["apple"], "rating": ["4.5"], "name": ["phone"]}
+
+
+def test_read_csv_files_quoted_newline(tmp_path):
+    """Тест сохранения перевода строки внутри значения в кавычках."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_bytes(b'name,brand,price,rating\r\n"phone\r\npro",apple,1000,4.5\r\n')
+
+    result = read_csv_files([str(file1)])
+
+    assert result["name"] == ["phone\r\npro"]
+
+
+def test_read_csv_files_utf8_bom(tmp_path):
+    """Тест чтения файла с BOM в начале."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_bytes(b"\xef\xbb\xbfname,brand,price,rating\np1,apple,1,4.5")
+
+    result = read_csv_files([str(file1)])
+
+    assert result == {"brand": ["apple"], "rating": ["4.5"], "name": ["p1"]}
+
+
+def test_read_csv_files_without_name_column():
+    """Тест: столбец 'name' необязателен."""
+    with patch("builtins.open", mock_open(read_data="brand,rating\napple,4.5")):
+        result = read_csv_files(["file1.csv"])
+
+    assert result == {"brand": ["apple"], "rating": ["4.5"], "name": [""]}
+
+
+def test_read_csv_files_missing_column():
+    """Тест ошибки при отсутствии нужного столбца."""
+    with patch("builtins.open", mock_open(read_data="name,price\nphone,1000")):
+        with pytest.raises(SystemExit):
+            read_csv_files(["file1.csv"])
+
+
+def test_read_csv_files_short_row(capsys):
+    """Тест ошибки для строки, в которой не хватает полей."""
+    with patch("builtins.open", mock_open(read_data="name,brand,price,rating\np1,apple,1000")):
+        with pytest.raises(SystemExit):
+            read_csv_files(["file1.csv"])
+
+    assert "Ошибка при чтении CSV-файла file1.csv: строка 2" in capsys.readouterr().err
 
 
 def test_read_csv_files_file_not_found():
@@ -53,19 +127,257 @@ def test_read_csv_files_file_not_found():
 def test_read_csv_files_csv_error():
     """Тест обработки ошибки чтения CSV."""
     with patch("builtins.open", mock_open(read_data="invalid,csv,data")):
-        with patch("csv.DictReader", side_effect=csv.Error("CSV error")):
+        with patch("csv.reader", side_effect=csv.Error("CSV error")):
             with pytest.raises(SystemExit):
                 read_csv_files(["bad.csv"])
 
 
+def test_stream_records_is_lazy():
+    """Тест потокового чтения: файлы открываются только при обходе записей."""
+    mock_csv = "name,brand,price,rating\nphone1,apple,1000,4.5\nphone2,apple,900,4.7"
+
+    with patch("builtins.open", mock_open(read_data=mock_csv)) as mocked:
+        records = stream_records(["file1.csv"])
+        mocked.assert_not_called()
+        result = calculate_average_rating(records)
+
+    assert result == [("apple", pytest.approx(4.6))]
+
+
+# --- Тесты для read_csv_files_arrow ---
+
+def test_main_module_does_not_import_pyarrow():
+    """Тест: pyarrow не импортируется, пока не выбран движок 'arrow'."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, main; print('pyarrow' in sys.modules)"],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+@requires_arrow
+def test_read_csv_files_arrow_multiple_files(tmp_path):
+    """Тест чтения нескольких CSV-файлов через PyArrow."""
+    file1 = tmp_path / "file1.csv"
+    file2 = tmp_path / "file2.csv"
+    file1.write_text("name,brand,price,rating\nphone1,apple,1000,4.5", encoding="utf-8")
+    file2.write_text("name,brand,price,rating\nphone2,samsung,900,4.7", encoding="utf-8")
+
+    table = read_csv_files_arrow([str(file1), str(file2)])
+
+    assert table.num_rows == 2
+    assert table.column_names == ["brand", "rating"]
+    assert table.column("brand").to_pylist() == ["apple", "samsung"]
+    assert pa.types.is_dictionary(table.schema.field("brand").type)
+    assert table.schema.field("rating").type == pa.float64()
+
+
+@requires_arrow
+def test_read_csv_files_arrow_file_not_found(tmp_path):
+    """Тест обработки ошибки отсутствия файла в движке PyArrow."""
+    with pytest.raises(SystemExit):
+        read_csv_files_arrow([str(tmp_path / "nonexistent.csv")])
+
+
+@requires_arrow
+def test_read_csv_files_arrow_without_name_column(tmp_path, capsys):
+    """Тест: без столбца 'name' некорректный рейтинг пропускается с предупреждением."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("brand,rating\napple,bad\napple,4.5", encoding="utf-8")
+
+    table = read_csv_files_arrow([str(file1)])
+
+    assert calculate_average_rating_arrow(table) == [("apple", 4.5)]
+    assert "некорректный рейтинг 'bad' для товара , бренд apple" in capsys.readouterr().err
+
+
+@requires_arrow
+def test_read_csv_files_arrow_empty_brand(tmp_path):
+    """Тест: пустой бренд остаётся пустой строкой, как в движке 'python'."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\np1,,1,4.5\np2,lg,2,4.0", encoding="utf-8")
+
+    result = calculate_average_rating_arrow(read_csv_files_arrow([str(file1)]))
+
+    assert result == calculate_average_rating(stream_records([str(file1)]))
+    assert result == [("", 4.5), ("lg", 4.0)]
+
+
+@requires_arrow
+def test_read_csv_files_arrow_empty_file(tmp_path):
+    """Тест пропуска пустого файла, как в движке 'python'."""
+    empty = tmp_path / "empty.csv"
+    empty.write_bytes(b"")
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\nphone1,apple,1000,4.5", encoding="utf-8")
+
+    assert read_csv_files_arrow([str(empty)]).num_rows == 0
+    table = read_csv_files_arrow([str(empty), str(file1)])
+
+    assert calculate_average_rating_arrow(table) == [("apple", 4.5)]
+
+
+@requires_arrow
+def test_read_csv_files_arrow_missing_column(tmp_path):
+    """Тест ошибки при отсутствии нужного столбца."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,price,rating\nphone1,1000,4.5", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        read_csv_files_arrow([str(file1)])
+
+
+@requires_arrow
+def test_read_csv_files_arrow_invalid_rating(tmp_path, capsys):
+    """Тест замены некорректного рейтинга на null с предупреждением."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text(
+        "name,brand,price,rating\np1,apple,1000,invalid\np2,apple,1100,4.9",
+        encoding="utf-8"
+    )
+
+    table = read_csv_files_arrow([str(file1)])
+
+    assert table.column("rating").to_pylist() == [None, 4.9]
+    assert "некорректный рейтинг 'invalid' для товара p1" in capsys.readouterr().err
+
+
+@requires_arrow
+def test_read_csv_files_arrow_numeric_fast_path(tmp_path):
+    """Тест: корректный файл читается один раз, без строкового разбора рейтинга."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\np1,apple,1000,4.5\np2,lg,900,4.1", encoding="utf-8")
+
+    with patch("pyarrow.csv.read_csv", wraps=pac.read_csv) as mock_read:
+        table = read_csv_files_arrow([str(file1)])
+
+    assert mock_read.call_count == 1
+    assert table.column("rating").to_pylist() == [4.5, 4.1]
+
+
+@requires_arrow
+def test_read_csv_files_arrow_null_like_rating_warning(tmp_path, capsys):
+    """Тест: в предупреждении выводится исходное значение вроде 'NA'."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\np1,a,1,NA\np2,a,2,4", encoding="utf-8")
+
+    table = read_csv_files_arrow([str(file1)])
+
+    assert table.column("rating").to_pylist() == [None, 4.0]
+    assert "некорректный рейтинг 'NA' для товара p1" in capsys.readouterr().err
+
+
+@requires_arrow
+def test_read_csv_files_arrow_infinite_rating(tmp_path, capsys):
+    """Тест: inf отклоняется и тогда, когда других некорректных рейтингов нет."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\np1,a,1,inf\np2,a,2,4", encoding="utf-8")
+
+    table = read_csv_files_arrow([str(file1)])
+
+    assert table.column("rating").to_pylist() == [None, 4.0]
+    assert calculate_average_rating_arrow(table) == [("a", 4.0)]
+    assert "некорректный рейтинг 'inf' для товара p1" in capsys.readouterr().err
+
+
+@requires_arrow
+def test_read_csv_files_arrow_header_only_file(tmp_path):
+    """Тест: файл только с заголовком разбирается один раз."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\n", encoding="utf-8")
+
+    with patch("pyarrow.csv.read_csv", wraps=pac.read_csv) as mock_read:
+        table = read_csv_files_arrow([str(file1)])
+
+    assert mock_read.call_count == 1
+    assert table.num_rows == 0
+
+
+@requires_arrow
+def test_read_csv_files_arrow_invalid_ratings_single_write(tmp_path):
+    """Тест вывода всех предупреждений одним вызовом write."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text(
+        "name,brand,price,rating\np1,apple,1000,bad\np2,apple,1100,\np3,lg,900,4.1",
+        encoding="utf-8"
+    )
+
+    with patch("sys.stderr") as mock_stderr:
+        table = read_csv_files_arrow([str(file1)])
+
+    assert table.column("rating").to_pylist() == [None, None, 4.1]
+    mock_stderr.write.assert_called_once()
+    assert mock_stderr.write.call_args[0][0].count("Пропускаем.") == 2
+
+
+@requires_arrow
+def test_read_csv_files_arrow_parquet_cache(tmp_path):
+    """Тест повторного чтения данных из Parquet-кэша."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\nphone1,apple,1000,4.5", encoding="utf-8")
+
+    first = read_csv_files_arrow([str(file1)], cache_parquet=True)
+    assert (tmp_path / "file1.csv.parquet").exists()
+
+    with patch("pyarrow.csv.read_csv", side_effect=AssertionError("CSV не должен читаться")):
+        second = read_csv_files_arrow([str(file1)], cache_parquet=True)
+
+    assert second.column_names == ["brand", "rating"]
+    assert second.to_pylist() == first.to_pylist() == [{"brand": "apple", "rating": 4.5}]
+
+
+@requires_arrow
+def test_read_csv_files_arrow_corrupt_parquet_cache(tmp_path):
+    """Тест: повреждённый кэш игнорируется и перезаписывается."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\nphone1,apple,1000,4.5", encoding="utf-8")
+    cache = tmp_path / "file1.csv.parquet"
+    cache.write_bytes(b"PAR1 truncated")
+
+    table = read_csv_files_arrow([str(file1)], cache_parquet=True)
+
+    assert table.to_pylist() == [{"brand": "apple", "rating": 4.5}]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["file1.csv", "file1.csv.parquet"]
+    with patch("pyarrow.csv.read_csv", side_effect=AssertionError("CSV не должен читаться")):
+        assert read_csv_files_arrow([str(file1)], cache_parquet=True).to_pylist() == table.to_pylist()
+
+
+@requires_arrow
+def test_read_csv_files_arrow_parquet_cache_keeps_warnings(tmp_path, capsys):
+    """Тест повторного вывода предупреждений при чтении из кэша."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text("name,brand,price,rating\np1,apple,1000,bad\np2,apple,900,4.1", encoding="utf-8")
+
+    read_csv_files_arrow([str(file1)], cache_parquet=True)
+    first = capsys.readouterr().err
+    with patch("pyarrow.csv.read_csv", side_effect=AssertionError("CSV не должен читаться")):
+        table = read_csv_files_arrow([str(file1)], cache_parquet=True)
+
+    assert "некорректный рейтинг 'bad' для товара p1" in first
+    assert capsys.readouterr().err == first
+    assert table.schema.metadata is None
+
+
+def test_main_rejects_cache_parquet_without_arrow():
+    """Тест: --cache-parquet без движка 'arrow' — ошибка аргументов."""
+    argv = ["main.py", "--files", "f.csv", "--report", "average-rating", "--cache-parquet"]
+    with patch("sys.argv", argv), patch("sys.stderr"):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 2
+
+
 # --- Тесты для calculate_average_rating ---
 
 def test_calculate_average_rating_normal():
     """Тест расчёта среднего рейтинга для нескольких брендов."""
     records = [
-        {"name": "p1", "brand": "apple", "price": "1000", "rating": "4.5"},
-        {"name": "p2", "brand": "samsung", "price": "900", "rating": "4.7"},
-        {"name": "p3", "brand": "apple", "price": "1100", "rating": "4.9"},
+        ("apple", "4.5", "p1"),
+        ("samsung", "4.7", "p2"),
+        ("apple", "4.9", "p3"),
     ]
 
     result = calculate_average_rating(records)
@@ -80,8 +392,8 @@ def test_calculate_average_rating_normal():
 def test_calculate_average_rating_single_brand():
     """Тест для одного бренда."""
     records = [
-        {"name": "p1", "brand": "xiaomi", "price": "500", "rating": "4.2"},
-        {"name": "p2", "brand": "xiaomi", "price": "600", "rating": "4.8"},
+        ("xiaomi", "4.2", "p1"),
+        ("xiaomi", "4.8", "p2"),
     ]
 
     result = calculate_average_rating(records)
@@ -94,8 +406,8 @@ def test_calculate_average_rating_single_brand():
 def test_calculate_average_rating_invalid_rating():
     """Тест пропуска записей с некорректным рейтингом."""
     records = [
-        {"name": "p1", "brand": "apple", "price": "1000", "rating": "invalid"},
-        {"name": "p2", "brand": "apple", "price": "1100", "rating": "4.9"},
+        ("apple", "invalid", "p1"),
+        ("apple", "4.9", "p2"),
     ]
 
     with patch("sys.stderr"):
@@ -106,6 +418,21 @@ def test_calculate_average_rating_invalid_rating():
     assert pytest.approx(result[0][1]) == 4.9
 
 
+def test_calculate_average_rating_invalid_ratings_single_write():
+    """Тест вывода всех предупреждений одним вызовом write."""
+    records = [
+        ("apple", "bad", "p1"),
+        ("apple", "", "p2"),
+        ("apple", "4.9", "p3"),
+    ]
+
+    with patch("sys.stderr") as mock_stderr:
+        calculate_average_rating(records)
+
+    mock_stderr.write.assert_called_once()
+    assert mock_stderr.write.call_args[0][0].count("Пропускаем.") == 2
+
+
 def test_calculate_average_rating_empty_list():
     """Тест для пустого списка записей."""
     result = calculate_average_rating([])
@@ -115,9 +442,9 @@ def test_calculate_average_rating_empty_list():
 def test_calculate_average_rating_sorting():
     """Тест сортировки по убыванию рейтинга."""
     records = [
-        {"name": "p1", "brand": "a", "price": "1", "rating": "3.0"},
-        {"name": "p2", "brand": "b", "price": "2", "rating": "5.0"},
-        {"name": "p3", "brand": "c", "price": "3", "rating": "4.0"},
+        ("a", "3.0", "p1"),
+        ("b", "5.0", "p2"),
+        ("c", "4.0", "p3"),
     ]
 
     result = calculate_average_rating(records)
@@ -125,19 +452,139 @@ def test_calculate_average_rating_sorting():
     assert [brand for brand, _ in result] == ["b", "c", "a"]  # 5.0 > 4.0 > 3.0
 
 
+def test_calculate_average_rating_from_columns():
+    """Тест расчёта по данным, прочитанным по столбцам."""
+    mock_csv = "name,brand,price,rating\np1,apple,1000,4.5\np2,lg,900,4.1\np3,apple,1100,4.9"
+
+    with patch("builtins.open", mock_open(read_data=mock_csv)):
+        columns = read_csv_files(["file1.csv"])
+
+    result = calculate_average_rating(zip(columns["brand"], columns["rating"], columns["name"]))
+
+    assert result == [("apple", pytest.approx(4.7)), ("lg", pytest.approx(4.1))]
+
+
+def test_calculate_average_rating_top():
+    """Тест выбора top брендов с наибольшим рейтингом."""
+    records = [
+        ("a", "3.0", "p1"),
+        ("b", "5.0", "p2"),
+        ("c", "4.0", "p3"),
+        ("d", "4.0", "p4"),
+    ]
+
+    result = calculate_average_rating(records, top=2)
+
+    assert result == [("b", 5.0), ("c", 4.0)]
+
+
+# --- Тесты для calculate_average_rating_arrow ---
+
+@requires_arrow
+def test_calculate_average_rating_arrow_normal():
+    """Тест расчёта среднего рейтинга в Arrow с пропуском пустых рейтингов."""
+    table = pa.table({
+        "brand": ["apple", "samsung", "apple", "xiaomi"],
+        "rating": [4.5, 4.8, 4.9, None],
+    })
+
+    result = calculate_average_rating_arrow(table)
+
+    assert [brand for brand, _ in result] == ["samsung", "apple"]
+    assert pytest.approx(result[0][1]) == 4.8
+    assert pytest.approx(result[1][1]) == 4.7
+
+
+@requires_arrow
+def test_calculate_average_rating_arrow_dictionary_brands():
+    """Тест группировки по брендам из частей с разными словарями."""
+    brand_type = pa.dictionary(pa.int32(), pa.string())
+    part1 = pa.table({"brand": pa.array(["apple", "lg"], brand_type), "rating": [4.0, 3.0]})
+    part2 = pa.table({"brand": pa.array(["lg", "apple"], brand_type), "rating": [5.0, 5.0]})
+
+    result = calculate_average_rating_arrow(pa.concat_tables([part1, part2]))
+
+    assert result == [("apple", 4.5), ("lg", 4.0)]
+
+
+@requires_arrow
+def test_calculate_average_rating_arrow_top():
+    """Тест ограничения результата Arrow первыми top брендами."""
+    table = pa.table({"brand": ["a", "b", "c"], "rating": [3.0, 5.0, 4.0]})
+
+    result = calculate_average_rating_arrow(table, top=2)
+
+    assert result == [("b", 5.0), ("c", 4.0)]
+
+
+@requires_arrow
+def test_calculate_average_rating_arrow_matches_python_rounding(tmp_path):
+    """Тест совпадения округлённых средних в движках 'arrow' и 'python'."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text(
+        "name,brand,price,rating\np1,apple,1,4.9\np2,apple,2,4.7\np3,apple,3,4.1\np4,apple,4,4.5",
+        encoding="utf-8"
+    )
+
+    arrow_result = calculate_average_rating_arrow(read_csv_files_arrow([str(file1)]))
+    python_result = calculate_average_rating(stream_records([str(file1)]))
+
+    assert [f"{rating:.1f}" for _, rating in arrow_result] == ["4.6"]
+    assert [f"{rating:.1f}" for _, rating in python_result] == ["4.6"]
+
+
+@requires_arrow
+def test_engines_reject_non_finite_ratings(tmp_path, capsys):
+    """Тест: оба движка одинаково пропускают nan и inf."""
+    file1 = tmp_path / "file1.csv"
+    file1.write_text(
+        "name,brand,price,rating\np1,a,1,nan\np2,a,2,inf\np3,a,3,-inf\np4,a,4,4.0",
+        encoding="utf-8"
+    )
+
+    python_result = calculate_average_rating(stream_records([str(file1)]))
+    python_err = capsys.readouterr().err
+    arrow_result = calculate_average_rating_arrow(read_csv_files_arrow([str(file1)]))
+    arrow_err = capsys.readouterr().err
+
+    assert python_result == arrow_result == [("a", 4.0)]
+    assert python_err == arrow_err
+    assert python_err.count("Пропускаем.") == 3
+
+
+@requires_arrow
+def test_calculate_average_rating_arrow_empty_table():
+    """Тест для пустой таблицы."""
+    table = pa.table({"brand": pa.array([], pa.string()), "rating": pa.array([], pa.float64())})
+    assert calculate_average_rating_arrow(table) == []
+
+
 # --- Тесты для generate_report ---
 
-def test_generate_report_average_rating():
+def test_generate_report_average_rating(capsys):
     """Тест генерации отчёта average-rating."""
     data = [("apple", 4.7), ("samsung", 4.6)]
 
-    with patch("builtins.print") as mock_print:
-        generate_report("average-rating", data)
+    generate_report("average-rating", data)
+
+    assert capsys.readouterr().out == (
+        "+---------+----------+\n"
+        "| Brand   |   Rating |\n"
+        "+=========+==========+\n"
+        "| apple   |      4.7 |\n"
+        "+---------+----------+\n"
+        "| samsung |      4.6 |\n"
+        "+---------+----------+\n"
+    )
+
+
+def test_generate_report_integral_average(capsys):
+    """Тест: целое среднее выводится с одним знаком после запятой."""
+    generate_report("average-rating", [("lg", 4.0), ("apple", 10.0)])
 
-    output = mock_print.call_args[0][0]
-    assert "Brand | Average Rating! in output"
-    assert "apple | 4.7! in output"
-    assert "samsung | 4.6! in output"
+    output = capsys.readouterr().out
+    assert "| lg      |      4.0 |" in output
+    assert "| apple   |     10.0 |" in output
 
 
 def test_generate_report_unsupported_type():
@@ -146,14 +593,14 @@ def test_generate_report_unsupported_type():
         generate_report("invalid", [])
 
 
-def test_generate_report_empty_data():
+def test_generate_report_empty_data(capsys):
     """Тест отчёта с пустыми данными."""
-    with patch("builtins.print") as mock_print:
-        generate_report("average-rating", [])
+    generate_report("average-rating", [])
 
-    output = mock_print.call_args[0][0]
-    assert "Brand | Average Rating! in output"
+    output = capsys.readouterr().out
+    assert "| Brand   |   Rating |" in output
     # Таблица будет без строк данных
+    assert len(output.splitlines()) == 4
 
 
 # --- Вспомогательные тесты ---
@@ -161,8 +608,8 @@ def test_generate_report_empty_data():
 def test_calculate_average_rating_case_sensitive_brands():
     """Тест учёта регистра в названиях брендов."""
     records = [
-        {"name": "p1", "brand": "Apple", "price": "1000", "rating": "4.5"},
-        {"name": "p2", "brand": "apple", "price": "1100", "rating": "4.9"},
+        ("Apple", "4.5", "p1"),
+        ("apple", "4.9", "p2"),
     ]
 
     result = calculate_average_rating(records)
@@ -176,7 +623,7 @@ def test_calculate_average_rating_case_sensitive_brands():
 def test_calculate_average_rating_zero_ratings():
     """Тест для бренда с нулевым рейтингом."""
     records = [
-        {"name": "p1", "brand": "zero", "price": "100", "rating": "0.0"},
+        ("zero", "0.0", "p1"),
     ]
 
     result = calculate_average_rating(records)